@@ -56,13 +56,12 @@ if [[ -z "${LOCAL_WHISPER_DEVICE:-}" ]]; then
 fi
 
 if [[ -z "${LOCAL_WHISPER_COMPUTE_TYPE:-}" ]]; then
-  if [[ "$LOCAL_WHISPER_DEVICE" == "cuda" ]]; then
-    LOCAL_WHISPER_COMPUTE_TYPE="float16"
-  elif [[ "$OS" == "darwin" && "$ARCH" == "arm64" ]]; then
+  if [[ "$OS" == "darwin" && "$ARCH" == "arm64" ]]; then
     LOCAL_WHISPER_COMPUTE_TYPE="int8"
     export LOCAL_WHISPER_BEAM_SIZE="${LOCAL_WHISPER_BEAM_SIZE:-1}"
   else
-    LOCAL_WHISPER_COMPUTE_TYPE="int8_float32"
+    # "auto" lets the server pick int8_float16 on CUDA and int8 on CPU when supported
+    LOCAL_WHISPER_COMPUTE_TYPE="auto"
   fi
 fi
 
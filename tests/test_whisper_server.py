@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 from pathlib import Path
+import asyncio
 import logging
 import sys
+import threading
+
+import numpy as np
+import pytest
 
 from fastapi.testclient import TestClient
 
@@ -16,7 +21,49 @@ from whisper_server import app
 TEST_AUDIO = ROOT_DIR / "test-speech.mp3"
 
 
-def test_transcription_endpoint_accepts_local_audio(monkeypatch, caplog):
+@pytest.fixture(scope="module")
+def client():
+    # Shared across the module; entering the client runs the lifespan, so skip model preloading.
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(whisper_server, "WHISPER_PRELOAD", False)
+        with TestClient(app) as test_client:
+            yield test_client
+
+
+@pytest.fixture(autouse=True)
+def online_hub(monkeypatch):
+    # get_model fails fast when HF_HUB_OFFLINE is set and files aren't cached; the fake models
+    # below are never cached, so don't let the host's offline setting leak into the tests.
+    monkeypatch.setattr(whisper_server.hf_constants, "HF_HUB_OFFLINE", False)
+
+
+@pytest.fixture(autouse=True)
+def model_registry():
+    # Fake models must not leak into later tests, even when an assertion fails mid-test.
+    def clear():
+        whisper_server._MODEL_CACHE.clear()
+        whisper_server._PIPELINE_CACHE.clear()
+        whisper_server._MODEL_LOCKS.clear()
+        whisper_server._compute_type_candidates.cache_clear()
+
+    clear()
+    yield
+    clear()
+
+
+class FakeSegment:
+    def __init__(self, start: float, end: float, text: str = "speech"):
+        # faster-whisper rounds segment times to 3 decimals
+        self.start = round(start, 3)
+        self.end = round(end, 3)
+        self.text = text
+        self.tokens = [0]
+        self.avg_logprob = 0.0
+        self.compression_ratio = 0.0
+        self.no_speech_prob = 0.0
+
+
+def test_transcription_endpoint_accepts_local_audio(client, monkeypatch, caplog):
     if not TEST_AUDIO.exists():
         raise AssertionError(f"Missing bundled audio fixture: {TEST_AUDIO}")
 
@@ -36,14 +83,16 @@ def test_transcription_endpoint_accepts_local_audio(monkeypatch, caplog):
         }
     ]
 
-    def fake_run_transcription(audio_path: Path, model_name: str):
-        assert Path(audio_path).exists()
+    def fake_run_transcription(
+        audio, model_name: str, language: str | None = None, include_segments: bool = True
+    ):
+        assert isinstance(audio, np.ndarray)
+        assert audio.dtype == np.float32 and audio.size
         assert model_name == "base"
         return "stub transcript", fake_segments
 
     monkeypatch.setattr("whisper_server.run_transcription", fake_run_transcription)
 
-    client = TestClient(app)
     with TEST_AUDIO.open("rb") as audio_bytes:
         response = client.post(
             "/v1/audio/transcriptions",
@@ -52,34 +101,272 @@ def test_transcription_endpoint_accepts_local_audio(monkeypatch, caplog):
         )
 
     assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
     payload = response.json()
     assert payload["model"] == "base"
     assert payload["text"] == "stub transcript"
     assert payload["segments"] == fake_segments
+    assert payload["id"].startswith("transcription-")
+    assert payload["created"] >= whisper_server._BOOT_TIME
     assert any("stub transcript" in record.getMessage() for record in caplog.records)
 
 
+def test_transcription_skips_segments_for_text_formats(client, monkeypatch):
+    if not TEST_AUDIO.exists():
+        raise AssertionError(f"Missing bundled audio fixture: {TEST_AUDIO}")
+
+    include_flags: list[bool] = []
+
+    def fake_run_transcription(
+        audio, model_name: str, language: str | None = None, include_segments: bool = True
+    ):
+        include_flags.append(include_segments)
+        return "stub transcript", []
+
+    monkeypatch.setattr("whisper_server.run_transcription", fake_run_transcription)
+
+    responses = {}
+    for response_format in ("json", "text", "srt"):
+        with TEST_AUDIO.open("rb") as audio_bytes:
+            responses[response_format] = client.post(
+                "/v1/audio/transcriptions",
+                files={"file": (TEST_AUDIO.name, audio_bytes, "audio/mpeg")},
+                data={"model": "base", "response_format": response_format},
+            )
+
+    assert include_flags == [False, False, True]
+    assert responses["json"].json()["text"] == "stub transcript"
+    assert "segments" not in responses["json"].json()
+    assert responses["text"].text == "stub transcript"
+    assert responses["text"].headers["content-type"].startswith("text/plain")
+    # Unimplemented formats fall back to verbose_json rather than failing existing clients.
+    assert responses["srt"].status_code == 200
+    assert responses["srt"].json()["segments"] == []
+
+
 def test_get_model_falls_back_when_float16_not_supported(monkeypatch):
-    whisper_server._MODEL_CACHE.clear()
     attempts: list[str] = []
 
     class FakeModel:
-        def __init__(self, name: str, device: str, compute_type: str):
+        def __init__(self, name: str, device: str, compute_type: str, **kwargs):
             attempts.append(compute_type)
             if compute_type == "float16":
                 raise ValueError("float16 unsupported")
+            self.kwargs = kwargs
             self.name = name
             self.device = device
             self.compute_type = compute_type
 
     monkeypatch.setattr(whisper_server, "WhisperModel", FakeModel)
     monkeypatch.setattr(whisper_server, "WHISPER_COMPUTE_TYPE", "float16", raising=False)
+    monkeypatch.setattr(whisper_server, "WHISPER_NUM_WORKERS", 2, raising=False)
+    monkeypatch.setattr(whisper_server, "WHISPER_CPU_THREADS", 3, raising=False)
 
     model = whisper_server.get_model("base")
 
     assert attempts[:2] == ["float16", "int8_float32"]
     assert model.compute_type == "int8_float32"
-    whisper_server._MODEL_CACHE.clear()
+    assert model.kwargs == {"cpu_threads": 3, "num_workers": 2}
+
+
+def test_model_cache_evicts_least_recently_used(monkeypatch):
+    loads: list[str] = []
+
+    class FakeModel:
+        def __init__(self, name: str, device: str, compute_type: str, **kwargs):
+            loads.append(name)
+
+    monkeypatch.setattr(whisper_server, "WhisperModel", FakeModel)
+    monkeypatch.setattr(whisper_server, "WHISPER_MAX_CACHED_MODELS", 2, raising=False)
+
+    whisper_server.get_model("tiny")
+    whisper_server.get_model("base")
+    whisper_server.get_model("tiny")
+    whisper_server.get_model("small")
+
+    assert list(whisper_server._MODEL_CACHE) == ["tiny", "small"]
+    assert set(whisper_server._PIPELINE_CACHE) == {"tiny", "small"}
+    assert set(whisper_server._MODEL_LOCKS) == {"tiny", "small"}
+    whisper_server.get_model("base")
+    assert loads == ["tiny", "base", "small", "base"]
+
+
+def test_unknown_model_name_leaves_cache_intact(monkeypatch):
+    class FakeModel:
+        def __init__(self, name: str, **kwargs):
+            self.name = name
+
+    monkeypatch.setattr(whisper_server, "WhisperModel", FakeModel)
+    monkeypatch.setattr(whisper_server, "WHISPER_MAX_CACHED_MODELS", 1, raising=False)
+    tiny = whisper_server.get_model("tiny")
+
+    with pytest.raises(whisper_server.ModelNotAvailableError):
+        whisper_server.get_model("tiny-typo")
+
+    assert list(whisper_server._MODEL_CACHE) == ["tiny"]
+    assert whisper_server.get_model("tiny") is tiny
+
+
+def test_cached_model_is_served_while_another_model_loads(monkeypatch):
+    loading = threading.Event()
+    release = threading.Event()
+
+    class FakeModel:
+        def __init__(self, name: str, **kwargs):
+            self.name = name
+            if name == "large-v3":
+                loading.set()
+                assert release.wait(timeout=5)
+
+    monkeypatch.setattr(whisper_server, "WhisperModel", FakeModel)
+    monkeypatch.setattr(whisper_server, "WHISPER_MAX_CACHED_MODELS", 2, raising=False)
+    tiny = whisper_server.get_model("tiny")
+
+    loader = threading.Thread(target=whisper_server.get_model, args=("large-v3",))
+    loader.start()
+    try:
+        assert loading.wait(timeout=5)
+        assert whisper_server.get_model("tiny") is tiny
+    finally:
+        release.set()
+        loader.join(timeout=5)
+
+    assert list(whisper_server._MODEL_CACHE) == ["tiny", "large-v3"]
+
+
+def test_flash_attention_enabled_for_cuda_half_precision(monkeypatch):
+    attempts: list[dict] = []
+
+    class FakeModel:
+        def __init__(self, name: str, **kwargs):
+            attempts.append(kwargs)
+            if kwargs.get("flash_attention"):
+                raise RuntimeError("flash attention is not supported on this GPU")
+
+    monkeypatch.setattr(whisper_server, "WhisperModel", FakeModel)
+    monkeypatch.setattr(whisper_server, "WHISPER_DEVICE", "cuda", raising=False)
+    monkeypatch.setattr(whisper_server, "WHISPER_FLASH_ATTENTION", True, raising=False)
+
+    whisper_server._load_whisper_model("base", "int8_float16")
+    whisper_server._load_whisper_model("base", "int8")
+
+    assert [attempt.get("flash_attention") for attempt in attempts] == [True, None, None]
+
+
+def test_compute_type_candidates_prefer_int8_for_auto(monkeypatch):
+    monkeypatch.setattr(whisper_server, "WHISPER_COMPUTE_TYPE", "auto", raising=False)
+    monkeypatch.setattr(whisper_server, "WHISPER_DEVICE", "cpu", raising=False)
+    monkeypatch.setattr(
+        whisper_server.ctranslate2,
+        "get_supported_compute_types",
+        lambda device: {"int8", "int8_float32", "float32"},
+    )
+    assert whisper_server._compute_type_candidates() == ("int8", "int8_float32", "float32", "auto")
+
+    monkeypatch.setattr(whisper_server, "WHISPER_DEVICE", "cuda", raising=False)
+    monkeypatch.setattr(
+        whisper_server.ctranslate2,
+        "get_supported_compute_types",
+        lambda device: {"int8_float16", "float16", "int8", "float32"},
+    )
+    whisper_server._compute_type_candidates.cache_clear()
+    assert whisper_server._compute_type_candidates() == ("int8_float16", "float16", "int8", "auto")
+
+
+def test_run_transcription_orders_vad_chunks_by_length(monkeypatch):
+    rate = whisper_server.SAMPLING_RATE
+    calls: list[dict] = []
+
+    class FakeModel:
+        class feature_extractor:
+            chunk_length = 30
+
+        def __init__(self, name: str, device: str, compute_type: str, **kwargs):
+            self.name = name
+
+    class FakePipeline:
+        def __init__(self, model):
+            self.model = model
+
+        def transcribe(self, audio, **kwargs):
+            assert isinstance(audio, np.ndarray)
+            calls.append(kwargs)
+            return iter(
+                FakeSegment(clip["start"] / rate, clip["end"] / rate, f" at {clip['start'] // rate}s ")
+                for clip in kwargs["clip_timestamps"]
+            ), None
+
+    clips = [
+        {"start": 0, "end": 25 * rate},
+        {"start": 26 * rate, "end": 30 * rate},
+        {"start": 31 * rate, "end": 55 * rate},
+    ]
+    monkeypatch.setattr(whisper_server, "WhisperModel", FakeModel)
+    monkeypatch.setattr(whisper_server, "BatchedInferencePipeline", FakePipeline)
+    monkeypatch.setattr(whisper_server, "WHISPER_BATCH_SIZE", 4, raising=False)
+    monkeypatch.setattr(whisper_server, "get_speech_timestamps", lambda audio, options: clips)
+    monkeypatch.setattr(
+        whisper_server, "merge_segments", lambda segments, options: [dict(clip) for clip in segments]
+    )
+
+    audio = np.zeros(60 * rate, dtype=np.float32)
+    full_text, segments = whisper_server.run_transcription(audio, "base", "en")
+
+    assert [call["clip_timestamps"] for call in calls] == [[clips[1], clips[2], clips[0]]]
+    assert all(call["batch_size"] == 4 and call["language"] == "en" for call in calls)
+    assert full_text == "at 0s at 26s at 31s"
+    assert [segment["id"] for segment in segments] == [0, 1, 2]
+    assert whisper_server._PIPELINE_CACHE["base"].model is whisper_server._MODEL_CACHE["base"]
+
+
+def test_startup_preloads_and_warms_default_model(monkeypatch):
+    warmed: list[tuple[str, int, bool]] = []
+
+    class FakePipeline:
+        def transcribe(self, audio, **kwargs):
+            warmed.append((model_names[-1], audio.shape[0], kwargs["vad_filter"]))
+            return iter([]), None
+
+    model_names: list[str] = []
+
+    def fake_get_pipeline(model_name: str):
+        model_names.append(model_name)
+        return FakePipeline()
+
+    monkeypatch.setattr(whisper_server, "WHISPER_PRELOAD", True, raising=False)
+    monkeypatch.setattr(whisper_server, "DEFAULT_MODEL_NAME", "base", raising=False)
+    monkeypatch.setattr(whisper_server, "get_pipeline", fake_get_pipeline)
+
+    # A dedicated client: the shared one disables preloading.
+    with TestClient(app) as startup_client:
+        assert startup_client.get("/healthz").status_code == 200
+
+    assert warmed == [("base", whisper_server.SAMPLING_RATE, False)]
+
+
+def test_get_model_fails_fast_when_offline_and_not_cached(monkeypatch):
+    class FakeModel:
+        def __init__(self, name: str, **kwargs):
+            raise AssertionError("missing models must not be constructed")
+
+    monkeypatch.setattr(whisper_server, "WhisperModel", FakeModel)
+    monkeypatch.setattr(whisper_server, "try_to_load_from_cache", lambda repo_id, filename: None)
+    monkeypatch.setattr(whisper_server.hf_constants, "HF_HUB_OFFLINE", True)
+
+    with pytest.raises(whisper_server.ModelNotAvailableError):
+        whisper_server.get_model("base")
+
+
+def test_get_model_maps_missing_files_to_model_not_available(monkeypatch):
+    class FakeModel:
+        def __init__(self, name: str, **kwargs):
+            raise FileNotFoundError("model.bin")
+
+    monkeypatch.setattr(whisper_server, "WhisperModel", FakeModel)
+
+    with pytest.raises(whisper_server.ModelNotAvailableError):
+        whisper_server.get_model("someone/missing-whisper")
+    assert "someone/missing-whisper" not in whisper_server._MODEL_LOCKS
 
 
 def test_normalize_model_name_uses_alias(monkeypatch):
@@ -91,16 +378,55 @@ def test_normalize_model_name_uses_alias(monkeypatch):
     assert normalized_default == "large-v3"
 
 
-def test_transcription_returns_503_when_model_missing(monkeypatch):
+def test_quantized_turbo_model_is_converted_once(monkeypatch, tmp_path):
+    conversions: list[tuple[str, str, str]] = []
+
+    class FakeConverter:
+        def __init__(self, source: str, copy_files=None):
+            self.source = source
+
+        def convert(self, output_dir: str, quantization: str, force: bool = False):
+            conversions.append((self.source, output_dir, quantization))
+            Path(output_dir).mkdir(parents=True)
+            (Path(output_dir) / "model.bin").write_bytes(b"")
+
+    class FakeModel:
+        def __init__(self, name: str, device: str, compute_type: str, **kwargs):
+            self.name = name
+
+    monkeypatch.setattr(whisper_server, "WHISPER_QUANTIZED", True, raising=False)
+    monkeypatch.setattr(whisper_server, "WHISPER_QUANT_DIR", tmp_path, raising=False)
+    monkeypatch.setattr("ctranslate2.converters.TransformersConverter", FakeConverter)
+    monkeypatch.setattr(whisper_server, "WhisperModel", FakeModel)
+    monkeypatch.setattr(whisper_server, "DEFAULT_MODEL_NAME", "large-v3-turbo", raising=False)
+    monkeypatch.setitem(whisper_server.MODEL_ALIASES, "whisper-1", "large-v3-turbo")
+
+    # The public name is kept for responses; only get_model sees the converted directory.
+    assert whisper_server.normalize_model_name("large-v3-turbo") == "large-v3-turbo"
+    assert whisper_server.normalize_model_name("whisper-1") == "large-v3-turbo"
+    assert whisper_server.normalize_model_name(None) == "large-v3-turbo"
+
+    model = whisper_server.get_model("large-v3-turbo")
+    assert whisper_server.get_model("whisper-1") is model
+    whisper_server._MODEL_CACHE.clear()
+    whisper_server.get_model("large-v3-turbo")
+
+    expected_dir = str(tmp_path / "large-v3-turbo-int8")
+    assert model.name == expected_dir
+    assert conversions == [("openai/whisper-large-v3-turbo", expected_dir, "int8")]
+
+
+def test_transcription_returns_503_when_model_missing(client, monkeypatch):
     if not TEST_AUDIO.exists():
         raise AssertionError(f"Missing bundled audio fixture: {TEST_AUDIO}")
 
-    def fake_run_transcription(audio_path: Path, model_name: str):
+    def fake_run_transcription(
+        audio, model_name: str, language: str | None = None, include_segments: bool = True
+    ):
         raise whisper_server.ModelNotAvailableError("model missing")
 
     monkeypatch.setattr("whisper_server.run_transcription", fake_run_transcription)
 
-    client = TestClient(app)
     with TEST_AUDIO.open("rb") as audio_bytes:
         response = client.post(
             "/v1/audio/transcriptions",
@@ -110,3 +436,227 @@ def test_transcription_returns_503_when_model_missing(monkeypatch):
 
     assert response.status_code == 503
     assert "not available locally" in response.json()["detail"]
+
+
+def test_dynamic_batch_routes_requests_through_scheduler(client, monkeypatch):
+    if not TEST_AUDIO.exists():
+        raise AssertionError(f"Missing bundled audio fixture: {TEST_AUDIO}")
+
+    batches: list[list[bool]] = []
+
+    def fake_run_batched_transcription(
+        audios, model_name: str, language: str | None = None, include_segments=None
+    ):
+        assert model_name == "base"
+        batches.append(include_segments)
+        return [("batched transcript", []) for _ in audios]
+
+    monkeypatch.setattr(whisper_server, "DYNAMIC_BATCH_ENABLED", True, raising=False)
+    monkeypatch.setattr(
+        whisper_server, "decode_upload", lambda upload: np.zeros(whisper_server.SAMPLING_RATE)
+    )
+    monkeypatch.setattr(
+        "whisper_server.run_batched_transcription", fake_run_batched_transcription
+    )
+
+    responses = {}
+    for response_format in ("verbose_json", "json"):
+        with TEST_AUDIO.open("rb") as audio_bytes:
+            responses[response_format] = client.post(
+                "/v1/audio/transcriptions",
+                files={"file": (TEST_AUDIO.name, audio_bytes, "audio/mpeg")},
+                data={"model": "base", "response_format": response_format},
+            )
+
+    assert all(response.status_code == 200 for response in responses.values())
+    assert responses["verbose_json"].json()["text"] == "batched transcript"
+    assert "segments" not in responses["json"].json()
+    # json requests skip building segments in the batched path too.
+    assert batches == [[True], [False]]
+
+
+def test_dynamic_batch_worker_fails_requests_instead_of_hanging(monkeypatch):
+    def broken_bucket(audio):
+        raise RuntimeError("bucketing failed")
+
+    monkeypatch.setattr(whisper_server, "DYNAMIC_BATCH_MAX_WAIT_MS", 0, raising=False)
+    monkeypatch.setattr(whisper_server, "_duration_bucket", broken_bucket)
+
+    async def submit_twice():
+        audio = np.zeros(whisper_server.SAMPLING_RATE, dtype=np.float32)
+        try:
+            for _ in range(2):
+                with pytest.raises(RuntimeError, match="bucketing failed"):
+                    await asyncio.wait_for(whisper_server.submit_transcription(audio, "base"), 5)
+            assert not whisper_server._BATCH_WORKER.done()
+        finally:
+            await whisper_server._stop_batch_worker()
+
+    asyncio.run(submit_twice())
+
+
+def test_shutdown_stops_dynamic_batch_worker(monkeypatch):
+    monkeypatch.setattr(whisper_server, "WHISPER_PRELOAD", False, raising=False)
+    # Long enough that the request is still waiting for batch-mates when the app shuts down.
+    monkeypatch.setattr(whisper_server, "DYNAMIC_BATCH_MAX_WAIT_MS", 10_000, raising=False)
+
+    async def serve_and_shut_down():
+        async with whisper_server.lifespan(app):
+            audio = np.zeros(whisper_server.SAMPLING_RATE, dtype=np.float32)
+            request = asyncio.ensure_future(whisper_server.submit_transcription(audio, "base"))
+            await asyncio.sleep(0.01)
+            worker = whisper_server._BATCH_WORKER
+            assert not worker.done()
+        assert worker.cancelled()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(request, 1)
+
+    asyncio.run(serve_and_shut_down())
+
+
+def test_transcribe_concatenated_splits_segments_per_audio():
+    rate = whisper_server.SAMPLING_RATE
+    audios = [np.zeros(rate * 2, dtype=np.float32), np.zeros(rate * 3, dtype=np.float32)]
+
+    class FakePipeline:
+        def transcribe(self, audio, **kwargs):
+            assert audio.shape[0] == rate * 5
+            assert kwargs["clip_timestamps"] == [
+                {"start": 0, "end": rate * 2},
+                {"start": rate * 2, "end": rate * 5},
+            ]
+            return iter([FakeSegment(0.5, 1.5, "first"), FakeSegment(2.5, 4.0, "second")]), None
+
+    clips = [[{"start": 0, "end": audio.shape[0]}] for audio in audios]
+    results = whisper_server._transcribe_concatenated(FakePipeline(), audios, clips, "en")
+    text_only = whisper_server._transcribe_concatenated(
+        FakePipeline(), audios, clips, "en", [True, False]
+    )
+
+    assert [text for text, _segments in results] == ["first", "second"]
+    assert results[1][1][0]["start"] == 0.5
+    assert results[1][1][0]["end"] == 2.0
+    assert text_only[0] == results[0]
+    assert text_only[1] == ("second", [])
+
+
+def test_transcribe_concatenated_assigns_segments_at_file_boundaries():
+    rate = whisper_server.SAMPLING_RATE
+    # A length that is not a whole number of milliseconds, followed by speech at sample 0.
+    audios = [np.zeros(32005, dtype=np.float32), np.zeros(rate * 3, dtype=np.float32)]
+
+    class FakePipeline:
+        def transcribe(self, audio, **kwargs):
+            return iter(
+                FakeSegment(clip["start"] / rate, clip["end"] / rate)
+                for clip in kwargs["clip_timestamps"]
+            ), None
+
+    clips = [[{"start": 0, "end": audio.shape[0]}] for audio in audios]
+    results = whisper_server._transcribe_concatenated(FakePipeline(), audios, clips, "en")
+
+    assert [len(segments) for _text, segments in results] == [1, 1]
+    assert results[1][1][0]["start"] == 0.0
+    assert results[1][1][0]["end"] == 3.0
+
+
+def test_detect_language_reuses_vad_clips():
+    rate = whisper_server.SAMPLING_RATE
+    audio = np.arange(60 * rate, dtype=np.float32)
+    calls: list[dict] = []
+
+    class FakeModel:
+        class model:
+            is_multilingual = True
+
+        class feature_extractor:
+            chunk_length = 30
+
+        def detect_language(self, **kwargs):
+            calls.append(kwargs)
+            return "de", 0.9, []
+
+    clips = [
+        {"start": 5 * rate, "end": 25 * rate},
+        {"start": 30 * rate, "end": 50 * rate},
+        {"start": 55 * rate, "end": 58 * rate},
+    ]
+
+    assert whisper_server._detect_language(FakeModel(), audio, clips) == "de"
+    assert whisper_server._detect_language(FakeModel(), audio, []) is None
+    assert len(calls) == 1
+    assert calls[0]["vad_filter"] is False
+    speech = calls[0]["audio"]
+    assert speech.shape[0] == 30 * rate
+    assert speech[0] == 5 * rate and speech[20 * rate] == 30 * rate
+
+
+def test_decode_upload_matches_faster_whisper_decoder():
+    from faster_whisper import decode_audio
+
+    expected = decode_audio(str(TEST_AUDIO), sampling_rate=whisper_server.SAMPLING_RATE)
+    with TEST_AUDIO.open("rb") as audio_file:
+        decoded = whisper_server.decode_upload(audio_file)
+
+    assert decoded.dtype == np.float32
+    assert decoded.shape == expected.shape
+    assert np.allclose(decoded, expected, atol=1e-3)
+
+
+def test_small_uploads_are_decoded_from_memory(client, monkeypatch):
+    on_disk: list[bool] = []
+
+    def fake_decode_upload(upload):
+        # An in-memory spool has no name; once it rolls over it is backed by a file descriptor.
+        on_disk.append(getattr(upload, "name", None) is not None)
+        return np.zeros(whisper_server.SAMPLING_RATE, dtype=np.float32)
+
+    monkeypatch.setattr(whisper_server, "decode_upload", fake_decode_upload)
+    monkeypatch.setattr(
+        "whisper_server.run_transcription", lambda audio, *args: ("stub transcript", [])
+    )
+
+    response = client.post(
+        "/v1/audio/transcriptions",
+        files={"file": ("clip.mp3", b"\0" * (2 * 1024 * 1024), "audio/mpeg")},
+        data={"model": "base"},
+    )
+
+    assert response.status_code == 200
+    assert on_disk == [False]
+
+
+def test_transcription_rejects_empty_upload(client, monkeypatch):
+    def fake_run_transcription(
+        audio, model_name: str, language: str | None = None, include_segments: bool = True
+    ):
+        raise AssertionError("empty uploads must not be transcribed")
+
+    monkeypatch.setattr("whisper_server.run_transcription", fake_run_transcription)
+
+    response = client.post(
+        "/v1/audio/transcriptions",
+        files={"file": ("empty.mp3", b"", "audio/mpeg")},
+        data={"model": "base"},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Uploaded file is empty."
+
+
+def test_transcription_rejects_undecodable_upload(client, monkeypatch):
+    def fake_run_transcription(
+        audio, model_name: str, language: str | None = None, include_segments: bool = True
+    ):
+        raise AssertionError("undecodable uploads must not be transcribed")
+
+    monkeypatch.setattr("whisper_server.run_transcription", fake_run_transcription)
+
+    response = client.post(
+        "/v1/audio/transcriptions",
+        files={"file": ("noise.mp3", b"not really audio", "audio/mpeg")},
+        data={"model": "base"},
+    )
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unable to decode uploaded audio file."
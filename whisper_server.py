@@ -1,16 +1,31 @@
 from __future__ import annotations
 
+import asyncio
+import bisect
+import concurrent.futures
+import functools
+import gc
+import itertools
 import logging
 import os
-import tempfile
 import threading
 import time
-import uuid
+from collections import OrderedDict, defaultdict
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import AsyncIterator, BinaryIO, Dict, Iterable, List, Tuple
 
+import av
+import ctranslate2
+import numpy as np
+from huggingface_hub import constants as hf_constants
+from huggingface_hub import try_to_load_from_cache
 from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
-from faster_whisper import WhisperModel
+from fastapi.responses import ORJSONResponse, PlainTextResponse
+from starlette.formparsers import MultiPartParser
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+from faster_whisper.utils import _MODELS as FASTER_WHISPER_REPOS
+from faster_whisper.vad import VadOptions, get_speech_timestamps, merge_segments
 
 logger = logging.getLogger("local-whisper")
 logging.basicConfig(level=logging.INFO)
@@ -19,26 +34,94 @@ DEFAULT_MODEL_NAME = os.getenv("LOCAL_WHISPER_MODEL", "large-v3-turbo")
 WHISPER_DEVICE = os.getenv("LOCAL_WHISPER_DEVICE", "auto")
 WHISPER_COMPUTE_TYPE = os.getenv("LOCAL_WHISPER_COMPUTE_TYPE", "auto")
 WHISPER_BEAM_SIZE = int(os.getenv("LOCAL_WHISPER_BEAM_SIZE", "5"))
+WHISPER_BATCH_SIZE = int(os.getenv("LOCAL_WHISPER_BATCH_SIZE", "8"))
+DYNAMIC_BATCH_ENABLED = os.getenv("LOCAL_WHISPER_DYNAMIC_BATCH", "0") == "1"
+DYNAMIC_BATCH_MAX_WAIT_MS = int(os.getenv("LOCAL_WHISPER_DYNAMIC_BATCH_WAIT_MS", "50"))
+DYNAMIC_BATCH_MAX_SIZE = int(os.getenv("LOCAL_WHISPER_DYNAMIC_BATCH_SIZE", "8"))
+# Upper bounds (seconds) of the duration buckets used to group queued requests
+DYNAMIC_BATCH_BUCKETS = (10.0, 30.0, 120.0)
+SAMPLING_RATE = 16000
+# Uploads up to this size stay in Starlette's in-memory spool and are decoded without touching disk
+UPLOAD_SPOOL_MAX_SIZE = int(os.getenv("LOCAL_WHISPER_UPLOAD_SPOOL_MB", "16")) * 1024 * 1024
+# Starlette spools multipart files to disk past 1 MB by default. This is a class attribute, so it
+# applies to every Starlette/FastAPI app in the process, not just this one.
+MultiPartParser.max_file_size = UPLOAD_SPOOL_MAX_SIZE
+# Concurrent transcriptions; keep in line with the WhisperModel worker/thread settings
+INFERENCE_WORKERS = int(os.getenv("LOCAL_WHISPER_WORKERS", "1"))
+# CTranslate2 workers per model: transcriptions that can run in parallel on one model.
+# Defaults to the executor size so every executor thread gets its own decoder stream.
+WHISPER_NUM_WORKERS = int(os.getenv("LOCAL_WHISPER_NUM_WORKERS", str(INFERENCE_WORKERS)))
+# Threads per CTranslate2 worker; defaults to splitting the cores evenly across workers.
+WHISPER_CPU_THREADS = int(
+    os.getenv(
+        "LOCAL_WHISPER_THREADS",
+        str(max(1, (os.cpu_count() or 4) // max(1, WHISPER_NUM_WORKERS))),
+    )
+)
+# Flash attention 2 for the decoder self-attention on CUDA with half-precision compute types
+WHISPER_FLASH_ATTENTION = os.getenv("LOCAL_WHISPER_FLASH_ATTENTION", "1") == "1"
+WHISPER_PRELOAD = os.getenv("LOCAL_WHISPER_PRELOAD", "1") == "1"
+# Least recently used models beyond this count are unloaded to keep RAM/VRAM bounded
+WHISPER_MAX_CACHED_MODELS = max(1, int(os.getenv("LOCAL_WHISPER_MAX_CACHED_MODELS", "2")))
+WHISPER_QUANTIZED = os.getenv("LOCAL_WHISPER_QUANT", "0") == "1"
+WHISPER_QUANT_DIR = Path(
+    os.getenv("LOCAL_WHISPER_QUANT_DIR", str(Path(__file__).resolve().parent / "models"))
+)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    await preload_default_model()
+    yield
+    await _stop_batch_worker()
+
 
 app = FastAPI(
     title="Local Whisper Server",
     version="1.0.0",
     description="OpenAI-compatible /v1/audio/transcriptions endpoint backed by faster-whisper.",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-_MODEL_CACHE: Dict[str, WhisperModel] = {}
-_MODEL_LOCK = threading.Lock()
+_MODEL_CACHE: OrderedDict[str, WhisperModel] = OrderedDict()
+_PIPELINE_CACHE: Dict[str, BatchedInferencePipeline] = {}
+# Guards cache mutation and _MODEL_LOCKS only; never held while a model loads.
+_REGISTRY_LOCK = threading.Lock()
+# One lock per model name, so loading one model never blocks requests for another.
+_MODEL_LOCKS: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+
+_INFER_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+    max_workers=INFERENCE_WORKERS, thread_name_prefix="whisper-infer"
+)
+
+# Response ids and timestamps come from a boot-time base instead of per-request uuid4()/time()
+_BOOT_TIME = int(time.time())
+_BOOT_MONOTONIC = time.monotonic()
+_ID_PREFIX = f"transcription-{_BOOT_TIME:x}-{os.getpid():x}"
+_ID_COUNTER = itertools.count()
+
+_BATCH_QUEUE: asyncio.Queue | None = None
+_BATCH_WORKER: asyncio.Task | None = None
 
 MODEL_ALIASES = {
     "large-v3-turbo": "large-v3",
     "whisper-1": DEFAULT_MODEL_NAME.lower(),
 }
 
+RESPONSE_FORMATS = ("json", "text", "verbose_json")
+
+# Hugging Face checkpoints converted to int8 CTranslate2 weights when LOCAL_WHISPER_QUANT=1
+QUANTIZED_MODEL_SOURCES = {
+    "large-v3-turbo": "openai/whisper-large-v3-turbo",
+}
+
 class ModelNotAvailableError(RuntimeError):
     """Raised when a requested model is not available locally."""
 
 
-def _compute_type_candidates() -> List[str]:
+@functools.lru_cache(maxsize=1)
+def _compute_type_candidates() -> Tuple[str, ...]:
     configured = (WHISPER_COMPUTE_TYPE or "auto").strip() or "auto"
     configured_lower = configured.lower()
     candidates: List[str] = []
@@ -47,99 +130,309 @@ def _compute_type_candidates() -> List[str]:
         if candidate and candidate not in candidates:
             candidates.append(candidate)
 
+    if configured_lower == "auto":
+        # Prefer the int8 kernels, which are the fastest on each device with negligible WER impact.
+        device = _resolve_device()
+        supported = ctranslate2.get_supported_compute_types(device)
+        preferred = (
+            ["int8_float16", "float16", "int8"]
+            if device == "cuda"
+            else ["int8", "int8_float32", "float32"]
+        )
+        for candidate in preferred:
+            if candidate in supported:
+                add(candidate)
     add(configured)
     if configured_lower == "float16":
         add("int8_float32")
         add("int8")
     add("auto")
-    return candidates
+    return tuple(candidates)
+
+
+def _resolve_device() -> str:
+    device = (WHISPER_DEVICE or "auto").strip().lower()
+    if device == "auto":
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    return device
 
 
 def normalize_model_name(requested_name: str | None) -> str:
     normalized = (requested_name or "").strip()
     normalized = normalized or DEFAULT_MODEL_NAME
     alias = MODEL_ALIASES.get(normalized.lower())
-    if alias:
+    if alias and _quantized_source(normalized) is None:
         logger.info("Model alias mapping applied: '%s' -> '%s'", normalized, alias)
         normalized = alias
     return normalized
 
 
+def _quantized_source(model_name: str) -> str | None:
+    if not WHISPER_QUANTIZED:
+        return None
+    return QUANTIZED_MODEL_SOURCES.get(model_name.lower())
+
+
+def _resolve_model_path(model_name: str) -> str:
+    """Maps a public model name to what WhisperModel loads, converting int8 weights if needed."""
+    source = _quantized_source(model_name)
+    if source is None:
+        return model_name
+    path = WHISPER_QUANT_DIR / f"{model_name.lower()}-int8"
+    if (path / "model.bin").exists():
+        return str(path)
+
+    logger.info("Converting '%s' to int8 CTranslate2 weights at %s", source, path)
+    try:
+        from ctranslate2.converters import TransformersConverter
+
+        converter = TransformersConverter(
+            source, copy_files=["tokenizer.json", "preprocessor_config.json"]
+        )
+        converter.convert(str(path), quantization="int8", force=True)
+    except Exception as exc:
+        raise ModelNotAvailableError(
+            f"Unable to build quantized model '{path}' from '{source}'. "
+            "Install 'transformers[torch]' or convert it manually with ct2-transformers-converter."
+        ) from exc
+    return str(path)
+
+
+def _evict_models(keep: int) -> bool:
+    # Callers hold _REGISTRY_LOCK. In-flight requests keep their own reference, so an evicted
+    # model is only freed once they finish.
+    evicted = False
+    while len(_MODEL_CACHE) > keep:
+        name = next(iter(_MODEL_CACHE))
+        del _MODEL_CACHE[name]
+        _PIPELINE_CACHE.pop(name, None)
+        _MODEL_LOCKS.pop(name, None)
+        logger.info("Evicting Whisper model '%s' from cache", name)
+        evicted = True
+    return evicted
+
+
+def _is_loadable_model_name(model_name: str) -> bool:
+    # Mirrors faster-whisper's download_model: a local directory, a known size, or a Hub repo id.
+    return Path(model_name).is_dir() or model_name in FASTER_WHISPER_REPOS or "/" in model_name
+
+
+def _model_files_cached(model_name: str) -> bool:
+    if Path(model_name).is_dir():
+        return True
+    repo_id = FASTER_WHISPER_REPOS.get(model_name, model_name)
+    return isinstance(try_to_load_from_cache(repo_id, "model.bin"), str)
+
+
+def _load_whisper_model(model_path: str, compute_type: str) -> WhisperModel:
+    kwargs = {
+        "device": WHISPER_DEVICE,
+        "compute_type": compute_type,
+        "cpu_threads": WHISPER_CPU_THREADS,
+        "num_workers": WHISPER_NUM_WORKERS,
+    }
+    use_flash_attention = (
+        WHISPER_FLASH_ATTENTION
+        and compute_type in ("float16", "int8_float16")
+        and _resolve_device() == "cuda"
+    )
+    if not use_flash_attention:
+        return WhisperModel(model_path, **kwargs)
+    try:
+        return WhisperModel(model_path, flash_attention=True, **kwargs)
+    except (RuntimeError, ValueError) as exc:
+        # Flash attention needs an Ampere or newer GPU and a CTranslate2 build that includes it.
+        logger.warning("Flash attention unavailable for '%s', loading without it: %s", model_path, exc)
+        return WhisperModel(model_path, **kwargs)
+
+
 def get_model(model_name: str) -> WhisperModel:
     normalized_name = normalize_model_name(model_name)
-    with _MODEL_LOCK:
-        if normalized_name in _MODEL_CACHE:
-            return _MODEL_CACHE[normalized_name]
+    model = _MODEL_CACHE.get(normalized_name)
+    if model is not None:
+        try:
+            _MODEL_CACHE.move_to_end(normalized_name)
+        except KeyError:
+            pass  # Evicted concurrently; the caller still holds a usable reference.
+        return model
 
-        last_error: Exception | None = None
-        for compute_type in _compute_type_candidates():
-            try:
-                logger.info(
-                    "Loading Whisper model '%s' (device=%s, compute_type=%s)",
-                    normalized_name,
-                    WHISPER_DEVICE,
-                    compute_type,
-                )
-                cpu_threads = int(os.getenv("LOCAL_WHISPER_THREADS", str(os.cpu_count() or 4)))
-                model = WhisperModel(
-                    normalized_name,
-                    device=WHISPER_DEVICE,
-                    compute_type=compute_type,
-                    cpu_threads=cpu_threads,
-                )
-                _MODEL_CACHE[normalized_name] = model
+    # Reject names WhisperModel can never load before evicting anything to make room for them.
+    if not _is_loadable_model_name(normalized_name):
+        raise ModelNotAvailableError(f"Unknown Whisper model '{normalized_name}'.")
+    with _REGISTRY_LOCK:
+        model_lock = _MODEL_LOCKS[normalized_name]
+    try:
+        with model_lock:
+            model = _MODEL_CACHE.get(normalized_name)
+            if model is not None:
                 return model
-            except ValueError as exc:
-                last_error = exc
-                logger.warning(
-                    "Failed to load Whisper model '%s' with compute_type=%s: %s",
-                    normalized_name,
-                    compute_type,
-                    exc,
+
+            model_path = _resolve_model_path(normalized_name)
+            if not _model_files_cached(model_path) and hf_constants.HF_HUB_OFFLINE:
+                raise ModelNotAvailableError(
+                    f"Model files for '{normalized_name}' are not available locally."
                 )
-                continue
+            # Free the least recently used model before loading so both are never resident at once.
+            with _REGISTRY_LOCK:
+                evicted = _evict_models(WHISPER_MAX_CACHED_MODELS - 1)
+            if evicted:
+                gc.collect()
 
-        message = f"Unable to load Whisper model '{normalized_name}' with any compute type."
-        if last_error:
-            error_text = str(last_error).lower()
-            missing = any(
-                phrase in error_text
-                for phrase in ["not found", "no such file", "could not be found"]
+            last_error: Exception | None = None
+            for compute_type in _compute_type_candidates():
+                try:
+                    logger.info(
+                        "Loading Whisper model '%s' from '%s' (device=%s, compute_type=%s)",
+                        normalized_name,
+                        model_path,
+                        WHISPER_DEVICE,
+                        compute_type,
+                    )
+                    model = _load_whisper_model(model_path, compute_type)
+                except ValueError as exc:
+                    last_error = exc
+                    logger.warning(
+                        "Failed to load Whisper model '%s' with compute_type=%s: %s",
+                        normalized_name,
+                        compute_type,
+                        exc,
+                    )
+                    continue
+                except OSError as exc:
+                    # Missing local files and failed Hub downloads/lookups all surface as OSError.
+                    raise ModelNotAvailableError(
+                        f"Model files for '{normalized_name}' are not available locally."
+                    ) from exc
+
+                with _REGISTRY_LOCK:
+                    # Another model may have finished loading meanwhile; stay within the limit.
+                    _evict_models(WHISPER_MAX_CACHED_MODELS - 1)
+                    _MODEL_CACHE[normalized_name] = model
+                    _PIPELINE_CACHE[normalized_name] = BatchedInferencePipeline(model=model)
+                return model
+
+            if last_error:
+                raise last_error
+            raise RuntimeError(
+                f"Unable to load Whisper model '{normalized_name}' with any compute type."
             )
-            if missing:
-                raise ModelNotAvailableError(
-                    f"{message} Model files are not available locally."
-                ) from last_error
-            raise last_error
-        raise RuntimeError(message)
+    finally:
+        # Only cached models keep a lock, so names that fail to load do not accumulate. A waiter
+        # still holding the dropped lock may load alongside a newer caller; the last insert wins.
+        with _REGISTRY_LOCK:
+            if normalized_name not in _MODEL_CACHE:
+                _MODEL_LOCKS.pop(normalized_name, None)
 
 
-def run_transcription(audio_path: Path, model_name: str, language: str | None = None) -> Tuple[str, List[Dict]]:
-    model = get_model(model_name)
-    
-    kwargs = {
-        "beam_size": WHISPER_BEAM_SIZE,
-        "vad_filter": True,
+def get_pipeline(model_name: str) -> BatchedInferencePipeline:
+    normalized_name = normalize_model_name(model_name)
+    model = get_model(normalized_name)
+    pipeline = _PIPELINE_CACHE.get(normalized_name)
+    if pipeline is not None:
+        return pipeline
+    with _REGISTRY_LOCK:
+        pipeline = _PIPELINE_CACHE.get(normalized_name)
+        if pipeline is None:
+            pipeline = BatchedInferencePipeline(model=model)
+            if normalized_name in _MODEL_CACHE:
+                _PIPELINE_CACHE[normalized_name] = pipeline
+        return pipeline
+
+
+def decode_upload(source: str | BinaryIO, sampling_rate: int = SAMPLING_RATE) -> np.ndarray:
+    # Resample straight to float32 mono instead of faster-whisper's decode_audio,
+    # which round-trips through int16 and forces a full gc.collect() per call.
+    resampler = av.AudioResampler(format="flt", layout="mono", rate=sampling_rate)
+    chunks: List[np.ndarray] = []
+    with av.open(source, mode="r", metadata_errors="ignore") as container:
+        frames = container.decode(audio=0)
+        while True:
+            try:
+                frame = next(frames)
+                frame.pts = None  # Skip the resampler's timestamp continuity check.
+            except StopIteration:
+                frame = None  # Flushes the resampler.
+            except av.error.InvalidDataError:
+                continue
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray().reshape(-1))
+            if frame is None:
+                break
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(chunks)
+
+
+def run_transcription(
+    audio: np.ndarray,
+    model_name: str,
+    language: str | None = None,
+    include_segments: bool = True,
+) -> Tuple[str, List[Dict]]:
+    pipeline = get_pipeline(model_name)
+    clips = _speech_clips(pipeline, audio)
+    if not clips:
+        return "", []
+    # Detect once up front; otherwise every bucket's transcribe call would detect again.
+    language = language or _detect_language(pipeline.model, audio, clips)
+    return _collect_segments(
+        _transcribe_clips(pipeline, audio, clips, language), include_segments=include_segments
+    )
+
+
+def _speech_clips(pipeline: BatchedInferencePipeline, audio: np.ndarray) -> List[Dict]:
+    vad_options = VadOptions(
+        max_speech_duration_s=pipeline.model.feature_extractor.chunk_length,
+        min_silence_duration_ms=160,
+    )
+    return [
+        {"start": clip["start"], "end": clip["end"]}
+        for clip in merge_segments(get_speech_timestamps(audio, vad_options), vad_options)
+    ]
+
+
+def _transcribe_clips(
+    pipeline: BatchedInferencePipeline, audio: np.ndarray, clips: List[Dict], language: str | None
+) -> List:
+    # A batch decodes until its longest chunk finishes. The pipeline batches clips in the order
+    # given, so sorting by length keeps similar chunks together while every batch stays full.
+    ordered_clips = sorted(clips, key=lambda clip: clip["end"] - clip["start"])
+    segments_generator, _info = pipeline.transcribe(
+        audio,
+        language=language,
+        beam_size=WHISPER_BEAM_SIZE,
+        batch_size=WHISPER_BATCH_SIZE,
+        clip_timestamps=ordered_clips,
         # Disabling prevents hallucination stalls on background noise in long audio
-        "condition_on_previous_text": False,
-    }
-    if language:
-        kwargs["language"] = language
+        condition_on_previous_text=False,
+    )
+    segments = list(segments_generator)
+    segments.sort(key=lambda segment: segment.start)
+    return segments
+
 
-    segments_generator, _info = model.transcribe(str(audio_path), **kwargs)
+def _collect_segments(
+    segments_iterable: Iterable, time_offset: float = 0.0, include_segments: bool = True
+) -> Tuple[str, List[Dict]]:
     segments: List[Dict] = []
     collected_text: List[str] = []
-    for index, segment in enumerate(segments_generator):
-        text = (segment.text or "").strip()
+    # Bound once: this loop runs per segment, hundreds of times for long recordings.
+    append_segment = segments.append
+    append_text = collected_text.append
+    for index, segment in enumerate(segments_iterable):
+        raw_text = segment.text
+        text = raw_text.strip() if raw_text else ""
         if text:
-            collected_text.append(text)
-        segments.append(
+            append_text(text)
+        if not include_segments:
+            continue
+        append_segment(
             {
                 "id": index,
                 "seek": 0,
-                "start": segment.start,
-                "end": segment.end,
-                "text": segment.text,
+                "start": round(segment.start - time_offset, 3) if time_offset else segment.start,
+                "end": round(segment.end - time_offset, 3) if time_offset else segment.end,
+                "text": raw_text,
                 "tokens": segment.tokens,
                 "temperature": 0.0,
                 "avg_logprob": segment.avg_logprob,
@@ -151,41 +444,279 @@ def run_transcription(audio_path: Path, model_name: str, language: str | None =
     return full_text, segments
 
 
+def _detect_language(model: WhisperModel, audio: np.ndarray, clips: List[Dict]) -> str | None:
+    if not clips:
+        return None
+    if not model.model.is_multilingual:
+        return "en"
+    # VAD already ran to find the clips, so detect on their speech rather than filtering again.
+    # Detection only looks at the first window, so stop collecting once it is full.
+    window = model.feature_extractor.chunk_length * SAMPLING_RATE
+    speech: List[np.ndarray] = []
+    collected = 0
+    for clip in clips:
+        speech.append(audio[clip["start"] : clip["end"]])
+        collected += clip["end"] - clip["start"]
+        if collected >= window:
+            break
+    language, _probability, _all_probs = model.detect_language(
+        audio=np.concatenate(speech)[:window], vad_filter=False
+    )
+    return language
+
+
+def _transcribe_concatenated(
+    pipeline: BatchedInferencePipeline,
+    audios: List[np.ndarray],
+    clips_per_audio: List[List[Dict]],
+    language: str | None,
+    include_segments: List[bool] | None = None,
+) -> List[Tuple[str, List[Dict]]]:
+    # Lay the files end to end and hand the pipeline every file's VAD clips at once,
+    # so chunks from different requests share the same encoder/decoder batches.
+    # faster-whisper rounds segment times to 1 ms, so each file starts on a 1 ms boundary;
+    # otherwise a segment at the very start of a file can round down into the previous one.
+    samples_per_ms = SAMPLING_RATE // 1000
+    parts: List[np.ndarray] = []
+    clip_timestamps: List[Dict] = []
+    offsets: List[float] = []
+    cursor = 0
+    for audio, clips in zip(audios, clips_per_audio):
+        offsets.append(round(cursor / SAMPLING_RATE, 3))
+        for clip in clips:
+            clip_timestamps.append({"start": clip["start"] + cursor, "end": clip["end"] + cursor})
+        parts.append(audio)
+        padding = -audio.shape[0] % samples_per_ms
+        if padding:
+            parts.append(np.zeros(padding, dtype=audio.dtype))
+        cursor += audio.shape[0] + padding
+
+    per_audio: List[List] = [[] for _ in audios]
+    if clip_timestamps:
+        segments = _transcribe_clips(pipeline, np.concatenate(parts), clip_timestamps, language)
+        for segment in segments:
+            owner = bisect.bisect_right(offsets, segment.start) - 1
+            per_audio[owner].append(segment)
+
+    if include_segments is None:
+        include_segments = [True] * len(audios)
+    return [
+        _collect_segments(segments, time_offset=offset, include_segments=include)
+        for segments, offset, include in zip(per_audio, offsets, include_segments)
+    ]
+
+
+def run_batched_transcription(
+    audios: List[np.ndarray],
+    model_name: str,
+    language: str | None = None,
+    include_segments: List[bool] | None = None,
+) -> List[Tuple[str, List[Dict]]]:
+    pipeline = get_pipeline(model_name)
+    # The pipeline detects a single language per call, so group by language first.
+    # VAD runs once per file; language detection and transcription both reuse its clips.
+    clips_per_audio = [_speech_clips(pipeline, audio) for audio in audios]
+    by_language: Dict[str | None, List[int]] = {}
+    for index, audio in enumerate(audios):
+        item_language = language or _detect_language(pipeline.model, audio, clips_per_audio[index])
+        by_language.setdefault(item_language, []).append(index)
+
+    if include_segments is None:
+        include_segments = [True] * len(audios)
+    results: List[Tuple[str, List[Dict]]] = [("", [])] * len(audios)
+    for item_language, indices in by_language.items():
+        group_results = _transcribe_concatenated(
+            pipeline,
+            [audios[index] for index in indices],
+            [clips_per_audio[index] for index in indices],
+            item_language,
+            [include_segments[index] for index in indices],
+        )
+        for index, result in zip(indices, group_results):
+            results[index] = result
+    return results
+
+
+def _duration_bucket(audio: np.ndarray) -> int:
+    return bisect.bisect_left(DYNAMIC_BATCH_BUCKETS, audio.shape[0] / SAMPLING_RATE)
+
+
+async def _dynamic_batch_worker(queue: asyncio.Queue) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        pending = [await queue.get()]
+        try:
+            deadline = loop.time() + DYNAMIC_BATCH_MAX_WAIT_MS / 1000
+            while len(pending) < DYNAMIC_BATCH_MAX_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            await _dispatch_batches(loop, pending)
+        except asyncio.CancelledError:
+            # Shutting down: cancel everything taken or still queued so no request waits forever.
+            while not queue.empty():
+                pending.append(queue.get_nowait())
+            for item in pending:
+                item[4].cancel()
+            raise
+        except Exception as exc:
+            # Fail this round's requests rather than leaving them hanging, and keep serving.
+            logger.exception("Dynamic batch dispatch failed: %s", exc)
+            for item in pending:
+                if not item[4].done():
+                    item[4].set_exception(exc)
+
+
+async def _dispatch_batches(loop: asyncio.AbstractEventLoop, pending: List[Tuple]) -> None:
+    groups: Dict[Tuple[str, str | None, int], List[Tuple]] = {}
+    for item in pending:
+        model_name, language, audio, _include_segments, _future = item
+        groups.setdefault((model_name, language, _duration_bucket(audio)), []).append(item)
+
+    for (model_name, language, bucket), items in groups.items():
+        logger.info(
+            "Dispatching dynamic batch size=%d model=%s bucket=%d",
+            len(items),
+            model_name,
+            bucket,
+        )
+        try:
+            results = await loop.run_in_executor(
+                _INFER_EXECUTOR,
+                run_batched_transcription,
+                [item[2] for item in items],
+                model_name,
+                language,
+                [item[3] for item in items],
+            )
+        except Exception as exc:
+            for item in items:
+                if not item[4].done():
+                    item[4].set_exception(exc)
+            continue
+        for item, result in zip(items, results):
+            if not item[4].done():
+                item[4].set_result(result)
+
+
+def _ensure_batch_worker() -> asyncio.Queue:
+    global _BATCH_QUEUE, _BATCH_WORKER
+    loop = asyncio.get_running_loop()
+    if _BATCH_WORKER is None or _BATCH_WORKER.done() or _BATCH_WORKER.get_loop() is not loop:
+        _BATCH_QUEUE = asyncio.Queue()
+        _BATCH_WORKER = loop.create_task(_dynamic_batch_worker(_BATCH_QUEUE))
+    return _BATCH_QUEUE
+
+
+async def _stop_batch_worker() -> None:
+    worker = _BATCH_WORKER
+    # The worker is bound to the loop that started it; only that loop can await it.
+    if worker is None or worker.done() or worker.get_loop() is not asyncio.get_running_loop():
+        return
+    worker.cancel()
+    try:
+        await worker
+    except asyncio.CancelledError:
+        pass
+
+
+async def submit_transcription(
+    audio: np.ndarray,
+    model_name: str,
+    language: str | None = None,
+    include_segments: bool = True,
+) -> Tuple[str, List[Dict]]:
+    queue = _ensure_batch_worker()
+    future = asyncio.get_running_loop().create_future()
+    await queue.put((model_name, language, audio, include_segments, future))
+    return await future
+
+
+def warm_up_model(model_name: str) -> None:
+    pipeline = get_pipeline(model_name)
+    # VAD would drop pure silence, so disable it to push one chunk through the encoder and decoder.
+    silence = np.zeros(SAMPLING_RATE, dtype=np.float32)
+    segments_generator, _info = pipeline.transcribe(
+        silence, vad_filter=False, beam_size=WHISPER_BEAM_SIZE, batch_size=1
+    )
+    for _segment in segments_generator:
+        pass
+
+
+async def preload_default_model() -> None:
+    if not WHISPER_PRELOAD:
+        return
+    start_time = time.monotonic()
+    try:
+        await asyncio.get_running_loop().run_in_executor(
+            _INFER_EXECUTOR, warm_up_model, DEFAULT_MODEL_NAME
+        )
+    except Exception as exc:
+        logger.warning("Failed to preload Whisper model '%s': %s", DEFAULT_MODEL_NAME, exc)
+        return
+    logger.info(
+        "Preloaded Whisper model '%s' in %.2fs", DEFAULT_MODEL_NAME, time.monotonic() - start_time
+    )
+
+
 @app.post("/v1/audio/transcriptions")
 async def create_transcription(
     request: Request,
     file: UploadFile = File(...),
     model: str | None = Form(None, alias="model"),
     language: str | None = Form(None, alias="language"),
+    response_format: str = Form("verbose_json", alias="response_format"),
 ):
     if not file.filename:
         raise HTTPException(status_code=400, detail="Uploaded file must include a filename.")
+    if response_format not in RESPONSE_FORMATS:
+        # Formats such as srt/vtt aren't implemented; keep serving the full JSON they used to get.
+        logger.info("Unsupported response_format '%s', using verbose_json", response_format)
+        response_format = "verbose_json"
+    # Only verbose_json returns segments, so skip building them for the other formats.
+    include_segments = response_format == "verbose_json"
 
-    try:
-        file_bytes = await file.read()
-    except Exception as exc:
-        logger.exception("Failed to read upload: %s", exc)
-        raise HTTPException(status_code=400, detail="Unable to read uploaded file.")
-
-    if not file_bytes:
+    # Starlette already spooled the upload, so decode straight from it rather than copying it again.
+    total_size = file.size
+    if total_size is None:
+        total_size = file.file.seek(0, os.SEEK_END)
+    if not total_size:
         raise HTTPException(status_code=400, detail="Uploaded file is empty.")
 
-    suffix = Path(file.filename).suffix or ".mp3"
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-        tmp_file.write(file_bytes)
-        temp_path = Path(tmp_file.name)
+    try:
+        await file.seek(0)
+        audio = await asyncio.to_thread(decode_upload, file.file)
+    except Exception as exc:
+        logger.exception("Failed to decode upload: %s", exc)
+        raise HTTPException(status_code=400, detail="Unable to decode uploaded audio file.")
 
     selected_model = normalize_model_name(model or request.query_params.get("model"))
     logger.info(
         "Received transcription request file=%s size=%.2f MB model=%s",
         file.filename,
-        len(file_bytes) / (1024 * 1024),
+        total_size / (1024 * 1024),
         selected_model,
     )
 
     try:
         start_time = time.monotonic()
-        full_text, segments = run_transcription(temp_path, selected_model, language)
+        if DYNAMIC_BATCH_ENABLED:
+            full_text, segments = await submit_transcription(
+                audio, selected_model, language, include_segments
+            )
+        else:
+            full_text, segments = await asyncio.get_running_loop().run_in_executor(
+                _INFER_EXECUTOR,
+                run_transcription,
+                audio,
+                selected_model,
+                language,
+                include_segments,
+            )
         elapsed = time.monotonic() - start_time
         preview = (full_text or "")[:200]
         logger.info(
@@ -204,20 +735,19 @@ async def create_transcription(
     except Exception as exc:
         logger.exception("Whisper transcription failed: %s", exc)
         raise HTTPException(status_code=500, detail="Whisper transcription failed.")
-    finally:
-        try:
-            temp_path.unlink()
-        except OSError:
-            logger.warning("Failed to remove temporary file %s", temp_path)
+
+    if response_format == "text":
+        return PlainTextResponse(full_text)
 
     response_payload = {
-        "id": f"transcription-{uuid.uuid4().hex}",
+        "id": f"{_ID_PREFIX}-{next(_ID_COUNTER):x}",
         "object": "transcription",
-        "created": int(time.time()),
+        "created": _BOOT_TIME + int(time.monotonic() - _BOOT_MONOTONIC),
         "model": selected_model,
         "text": full_text,
-        "segments": segments,
     }
+    if include_segments:
+        response_payload["segments"] = segments
     return response_payload
 
 